@@ -5,8 +5,11 @@
 # The rest of the behavior remains unchanged.
 
 #!/usr/bin/env python3
-import argparse, csv, json, math, os, sys, textwrap, re, time
-from collections import defaultdict, deque
+import argparse, csv, heapq, json, os, textwrap, re
+try:
+    import orjson  # optional: faster save()
+except ImportError:
+    orjson = None
 
 # ----------------------------
 # Utility & Data Structures
@@ -21,10 +24,15 @@ STARTING_SLOTS_DEFAULT = {
     "K": 1,
     "DST": 1,
 }
+FIXED_POSITIONS = {"QB","RB","WR","TE","K","DST"}
 FLEX_ELIGIBLE = {"RB","WR","TE"}
 
-SAFE_TAGS = {"established","young","usage","role","dual_threat"}
-RISKY_TAGS = {"rookie","injury","age","boom_bust","volatility","off_field","contract","committee","volatile"}
+SAFE_TAGS = frozenset({"established","young","usage","role","dual_threat"})
+RISKY_TAGS = frozenset({"rookie","injury","age","boom_bust","volatility","off_field","contract","committee","volatile"})
+
+_ADD_RE = re.compile(r'add\s+"([^"]+)"\s+([A-Z]+)\s+([A-Z]{2,3})\s*(\d+)?')
+_SETRANK_RE = re.compile(r'setrank\s+(espn|fp|ds|consensus)\s+"([^"]+)"\s+(\d+)')
+_TAG_RE = re.compile(r'tag\s+"([^"]+)"\s+(.+)$', re.IGNORECASE)
 
 def parse_args():
     p = argparse.ArgumentParser(description="Live PPR draft helper (multi-source ranks, safe/risky suggestions).")
@@ -34,6 +42,9 @@ def parse_args():
     p.add_argument("--csv", default="rankings_ppr_master.csv", help="Rankings CSV path")
     p.add_argument("--format", default="ppr", choices=["ppr","half","std"], help="Scoring (informational)")
     p.add_argument("--roster", default="", help="Override starting slots, e.g. QB:1,RB:2,WR:2,TE:1,FLEX:1,K:1,DST:1")
+    p.add_argument("--log", default="draft_state.jsonl", help="Picks log autosaved after every pick/undo")
+    p.add_argument("--resume", action="store_true", help="Rebuild the draft from --log instead of starting fresh")
+    p.add_argument("--new", action="store_true", help="Start a fresh draft even if --log holds one (overwrites it)")
     return p.parse_args()
 
 def parse_roster(s):
@@ -45,99 +56,104 @@ def parse_roster(s):
         slots[k.strip().upper()] = int(v)
     return slots
 
-def composite_rank(row):
+def to_float(x):
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return None
+
+# Source rank columns and their weights in the composite working rank
+RANK_WEIGHTS = (("ESPN_Clay_Rank", 0.5), ("FP_ECR_Rank", 0.3), ("DS_Rank", 0.2))
+# `setrank` source name -> rank column
+SETRANK_COLUMNS = {"espn": "ESPN_Clay_Rank", "fp": "FP_ECR_Rank", "ds": "DS_Rank"}
+
+def make_composite(fieldnames):
     """
-    Compute a composite 'working rank' using ESPN_Clay, FP_ECR, DS if available.
+    Build a composite 'working rank' function specialized to the columns in
+    fieldnames, so columns missing from the CSV header are never probed per row.
     Lower is better.
     Weighted average: ESPN 0.5, FP 0.3, DS 0.2 (fallback to whatever exists).
     Finally fallback to ConsensusRank.
+    The returned function gives (work_rank, weighted rank sum, weight total);
+    the sums let `setrank` update work_rank incrementally.
     """
-    fields = []
-    weights = []
-    def try_float(x):
-        try:
-            return float(x)
-        except:
-            return None
-    espn = try_float(row.get("ESPN_Clay_Rank",""))
-    fp   = try_float(row.get("FP_ECR_Rank",""))
-    ds   = try_float(row.get("DS_Rank",""))
-    cons = try_float(row.get("ConsensusRank",""))
-    if espn is not None:
-        fields.append(espn); weights.append(0.5)
-    if fp is not None:
-        fields.append(fp); weights.append(0.3)
-    if ds is not None:
-        fields.append(ds); weights.append(0.2)
-    if fields:
-        wavg = sum(f*w for f,w in zip(fields,weights)) / sum(weights)
-        return wavg
-    return cons if cons is not None else 9999.0
+    present = tuple((col, w) for col, w in RANK_WEIGHTS if col in fieldnames)
+    has_cons = "ConsensusRank" in fieldnames
+    def composite(row):
+        num = 0.0
+        den = 0.0
+        for col, w in present:
+            v = to_float(row[col])
+            if v is not None:
+                num += v*w; den += w
+        if den:
+            return num / den, num, den
+        cons = to_float(row["ConsensusRank"]) if has_cons else None
+        return (cons if cons is not None else 9999.0), num, den
+    return composite
+
+# Rankings CSV columns kept on each Player
+CSV_FIELDS = ("ConsensusRank","Player","Team","Pos","Bye","FP_ECR_Rank","ESPN_Clay_Rank","DS_Rank","RiskTag","Tier","Notes")
+
+class Player:
+    """One player row from the rankings CSV plus draft state and cached scoring fields."""
+    __slots__ = CSV_FIELDS + ("work_rank","taken_by","_risk","_bump","_name_key",
+                              "_printable","_short_line","_rank_num","_weight_den")
+
+    def __init__(self, Player, Team="", Pos="", Bye="", RiskTag="", Tier="", Notes="",
+                 ConsensusRank="", FP_ECR_Rank="", ESPN_Clay_Rank="", DS_Rank="", work_rank=9999.0,
+                 rank_num=0.0, weight_den=0.0):
+        self.ConsensusRank = ConsensusRank
+        self.Player = Player
+        self.Team = Team
+        self.Pos = Pos
+        self.Bye = Bye
+        self.FP_ECR_Rank = FP_ECR_Rank
+        self.ESPN_Clay_Rank = ESPN_Clay_Rank
+        self.DS_Rank = DS_Rank
+        self.Tier = Tier
+        self.Notes = Notes
+        self.work_rank = work_rank
+        # Weighted sum / total weight of the source ranks behind work_rank
+        self._rank_num = rank_num
+        self._weight_den = weight_den
+        self.taken_by = None
+        self._name_key = Player.strip().lower()  # lowercased name for lookup and `find`
+        self._bump = score_bump(self)
+        set_risk_tag(self, RiskTag)
+        self._short_line = f"  - {Player} {Team} {Pos}"
 
 def load_players(csv_path):
-    players = []
+    # Deduplicate by name while reading, keeping best (lowest) work_rank
+    unique = {}
     with open(csv_path, newline="", encoding="utf-8") as f:
         r = csv.DictReader(f)
+        composite = make_composite(r.fieldnames or ())
         for row in r:
-            row = {k: (v.strip() if isinstance(v,str) else v) for k,v in row.items()}
-            row["work_rank"] = composite_rank(row)
-            row["taken_by"] = None
-            row["RiskTag"] = row.get("RiskTag","")
-            players.append(row)
-    # Deduplicate by name keeping best (lowest) work_rank
-    unique = {}
-    for p in players:
-        name = p["Player"]
-        if name not in unique or p["work_rank"] < unique[name]["work_rank"]:
-            unique[name] = p
+            fields = {k: (row.get(k) or "").strip() for k in CSV_FIELDS}
+            work_rank, num, den = composite(fields)
+            name = fields["Player"]
+            prev = unique.get(name)
+            if prev is not None and prev.work_rank <= work_rank:
+                continue
+            unique[name] = Player(work_rank=work_rank, rank_num=num, weight_den=den, **fields)
     return list(unique.values())
 
-def snake_pick_order(teams, rounds):
-    # Returns list of (round, pick_within_round, global_pick, team_slot)
-    order = []
-    global_pick = 1
-    for rnd in range(1, rounds+1):
-        rng = range(1, teams+1) if rnd % 2 == 1 else range(teams, 0, -1)
-        for slot in rng:
-            order.append((rnd, (slot if rnd%2==1 else (teams-slot+1)), global_pick, slot))
-            global_pick += 1
-    return order
-
 # -------- Roster helpers (starters & needs) --------
 
-def assign_starters(roster, roster_slots):
-    """Return a shallow-copied list where each player has a _starter_slot assigned (pos or FLEX) if they fill a starting slot."""
-    ro = [dict(p) for p in roster]
-    for pl in ro:
-        pl["_starter_slot"] = None
-    # fill fixed positions first
-    for pos in ["QB","RB","WR","TE","K","DST"]:
-        need = roster_slots.get(pos,0)
-        filled = 0
-        for pl in ro:
-            if filled >= need: break
-            if pl["Pos"] == pos and pl["_starter_slot"] is None:
-                pl["_starter_slot"] = pos
-                filled += 1
-    # fill FLEX
-    flex_need = roster_slots.get("FLEX",0)
-    filled_flex = 0
-    if flex_need > 0:
-        for pl in ro:
-            if filled_flex >= flex_need: break
-            if pl["_starter_slot"] is None and pl["Pos"] in FLEX_ELIGIBLE:
-                pl["_starter_slot"] = "FLEX"
-                filled_flex += 1
-    return ro
-
-def needs_for_roster(roster, roster_slots):
-    """Return dict of how many starters remain to be filled for each slot."""
-    ro = assign_starters(roster, roster_slots)
-    need = {}
-    for pos, req in roster_slots.items():
-        have = sum(1 for p in ro if p.get("_starter_slot") == pos)
-        need[pos] = max(0, req - have)
-    return need
+def fast_needs(roster, roster_slots):
+    """Return dict of how many starters remain to be filled for each slot (fixed positions first, then FLEX)."""
+    have = {pos: 0 for pos in roster_slots}
+    spare_flex = 0
+    for p in roster:
+        pos = p.Pos
+        if pos in FIXED_POSITIONS and have.get(pos, 0) < roster_slots.get(pos, 0):
+            have[pos] += 1
+        elif pos in FLEX_ELIGIBLE:
+            spare_flex += 1
+    if "FLEX" in have:
+        have["FLEX"] = min(spare_flex, roster_slots["FLEX"])
+    return {pos: max(0, req - have[pos]) for pos, req in roster_slots.items()}
 
 def needs_str(need_dict):
     parts = []
@@ -150,122 +166,215 @@ def needs_str(need_dict):
 
 # -------- Scoring & suggestion --------
 
-def pos_need_multiplier(roster_slots, my_roster, pos, round_idx):
+def build_need_table(my_roster, roster_slots, round_idx):
     """
+    Return {pos: multiplier}, computed once per suggestion instead of per candidate.
     Increase value for positions where we still need starters.
     De-emphasize K/DST until late (after round ~10).
     """
-    if pos in ("K","DST"):
-        if round_idx < 10:
-            return 0.4
-        else:
-            return 0.9
-
-    # Direct positional need
-    ro = assign_starters(my_roster, roster_slots)
-    starters_have = sum(1 for p in ro if p.get("_starter_slot") == pos)
-    starters_needed = roster_slots.get(pos,0)
-    needed = 1.0
-    if starters_have < starters_needed:
-        needed += 0.6
-    else:
-        # Flex need
-        if pos in FLEX_ELIGIBLE:
-            flex_have = sum(1 for p in ro if p.get("_starter_slot") == "FLEX")
-            flex_needed = roster_slots.get("FLEX",0)
-            if flex_have < flex_needed:
-                needed += 0.3
-    return needed
-
-def risk_score(row):
-    tags = set([t.strip() for t in (row.get("RiskTag","") or "").split(",") if t.strip()])
-    safe = len(tags & SAFE_TAGS)
-    risky = len(tags & RISKY_TAGS)
+    need = fast_needs(my_roster, roster_slots)
+    flex_open = need.get("FLEX", 0) > 0
+    table = {}
+    for pos in set(roster_slots) | FLEX_ELIGIBLE | {"K","DST"}:
+        if pos in ("K","DST"):
+            table[pos] = 0.4 if round_idx < 10 else 0.9
+            continue
+        # Direct positional need
+        needed = 1.0
+        if need.get(pos, 0) > 0:
+            needed += 0.6
+        elif pos in FLEX_ELIGIBLE and flex_open:
+            # Flex need
+            needed += 0.3
+        table[pos] = needed
+    return table
+
+def set_risk_tag(p, tags):
+    """Set p.RiskTag and refresh everything cached from it (risk score, printable line)."""
+    p.RiskTag = tags
+    parsed = frozenset(t.strip() for t in tags.split(",") if t.strip())
     # Higher = riskier
-    return max(0, risky - safe)
-
-def value_score(row, roster_slots, my_roster, round_idx):
+    p._risk = max(0, len(parsed & RISKY_TAGS) - len(parsed & SAFE_TAGS))
+    p._printable = format_player(p)
+
+def score_bump(p):
+    """Position-specific bonus added to -work_rank when scoring (cached on the player as _bump)."""
+    if p.Pos == "WR":
+        # Slight WR bump in full PPR (informational only here)
+        return 1.0
+    if p.Pos == "TE":
+        # Gentle TE premium if top tiers
+        tier = p.Tier.lower()
+        if "tier 1" in tier or "tier 1-2" in tier:
+            return 2.0
+    return 0.0
+
+def score_candidates(avail, need_table):
+    """Score all candidates in one pass; returns a list of (value, risk, player)."""
+    need_get = need_table.get
     # Lower work_rank is better; convert to descending score
-    wr = float(row.get("work_rank", 9999.0))
-    base = -wr
-    pos = row.get("Pos","")
-    need = pos_need_multiplier(roster_slots, my_roster, pos, round_idx)
-    # Gentle TE premium if top tiers
-    tier = (row.get("Tier","") or "").lower()
-    if pos == "TE" and ("tier 1" in tier or "tier 1-2" in tier):
-        base += 2.0
-    # Slight WR bump in full PPR (informational only here)
-    if pos == "WR":
-        base += 1.0
-    return base * need
-
-def printable_player(row):
-    parts = [row.get("Player",""), row.get("Team",""), row.get("Pos","")]
-    by = row.get("Bye","")
-    if by:
-        parts.append(f"Bye {by}")
-    tags = row.get("RiskTag","")
-    if tags:
-        parts.append(f"[{tags}]")
-    return " ".join([p for p in parts if p])
+    return [((p._bump - p.work_rank) * need_get(p.Pos, 1.0), p._risk, p) for p in avail]
+
+def format_player(p):
+    parts = [p.Player, p.Team, p.Pos]
+    if p.Bye:
+        parts.append(f"Bye {p.Bye}")
+    if p.RiskTag:
+        parts.append(f"[{p.RiskTag}]")
+    return " ".join([x for x in parts if x])
+
+def printable_player(p):
+    """Cached format_player() string; kept current by set_risk_tag."""
+    return p._printable
+
+def read_log(path):
+    """
+    Parse a picks log into (ops, torn): ops is a list of (line number, op dict).
+    An unparseable final line (a torn write) is dropped and its line number
+    returned as torn; any other bad line raises ValueError naming path and line.
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        entries = [(n, line) for n, line in enumerate(f, start=1) if line.strip()]
+    ops = []
+    for i, (n, line) in enumerate(entries):
+        try:
+            op = json.loads(line)
+            if not isinstance(op, dict) or "op" not in op:
+                raise ValueError("no 'op' field")
+        except ValueError as e:
+            if i == len(entries) - 1:
+                return ops, n
+            raise ValueError(f"{path} line {n}: unreadable log entry ({e}). "
+                             "Fix or delete that line and resume again, or start over with --new.")
+        ops.append((n, op))
+    return ops, None
+
+def draft_in_progress(ops):
+    """True if parsed log ops hold a draft with picks still to make (worth resuming)."""
+    total = None
+    picks = 0
+    for _, op in ops:
+        if op["op"] == "start":
+            total = op.get("teams", 0) * op.get("rounds", 0)
+        elif op["op"] == "pick":
+            picks += 1
+        elif op["op"] == "undo":
+            picks -= 1
+    if total is None:
+        return bool(ops)
+    return len(ops) > 1 and picks < total
 
 class Draft:
-    def __init__(self, teams, my_slot, rounds, players, roster_slots):
+    def __init__(self, teams, my_slot, rounds, players, roster_slots, log_path=None):
         self.teams = teams
         self.my_slot = my_slot
         self.rounds = rounds
         self.players = players
-        self.order = snake_pick_order(teams, rounds)
-        self.picks = []  # list of dicts: {global_pick, team_slot, player_name}
+        self.picks = []  # list of dicts: {global_pick, team_slot, player, _ref}
         self.team_rosters = {i: [] for i in range(1, teams+1)}
         self.roster_slots = roster_slots
+        # Normalized name -> row; first row wins, matching the old linear scan
+        self._name_index = {}
+        for p in players:
+            self._name_index.setdefault(p._name_key, p)
+        # Untaken players keyed by id(row), kept in sync by record_pick/undo
+        self._available = {id(p): p for p in players if not p.taken_by}
+        # Append-only JSONL log of pick/undo/add/setrank/tag ops (autosave). A new log starts
+        # with the league settings so replay can check them.
+        self._log_path = log_path
+        self._log = None
+        if log_path is not None:
+            self._log = open(log_path, "w", encoding="utf-8")
+            self._log_op(op="start", teams=teams, my_slot=my_slot, rounds=rounds)
+
+    @classmethod
+    def replay(cls, path, teams, my_slot, rounds, players, roster_slots):
+        """
+        Rebuild a draft by re-applying the ops in a picks log, then keep logging to it.
+        Raises ValueError if the log was recorded with different league settings.
+        """
+        draft = cls(teams, my_slot, rounds, players, roster_slots)
+        ops, torn = read_log(path)
+        for n, op in ops:
+            try:
+                if op["op"] == "start":
+                    if (op["teams"], op["my_slot"], op["rounds"]) != (teams, my_slot, rounds):
+                        raise ValueError(f"{path} was recorded with --teams {op['teams']} --pick {op['my_slot']} "
+                                         f"--rounds {op['rounds']}; rerun --resume with those settings.")
+                elif op["op"] == "pick":
+                    draft.record_pick(op["team"], op["player"])
+                elif op["op"] == "undo":
+                    draft.undo()
+                elif op["op"] == "add":
+                    draft.add_player_if_missing(op["player"], pos=op["pos"], team=op["team"],
+                                                work_rank=op["rank"], risktag=op["risktag"])
+                elif op["op"] == "setrank":
+                    draft.set_rank(draft.find_player(op["player"]), op["src"], op["rank"])
+                elif op["op"] == "tag":
+                    draft.set_tags(draft.find_player(op["player"]), op["tags"])
+            except (KeyError, TypeError, AttributeError) as e:
+                raise ValueError(f"{path} line {n}: bad '{op['op']}' entry ({e!r}). "
+                                 "Fix or delete that line and resume again, or start over with --new.")
+        draft.replay_warnings = []
+        if torn is not None:
+            draft.replay_warnings.append(f"Ignored unreadable last line {torn} of {path} (incomplete write).")
+        # Rewrite the log from the entries that replayed, so later appends never follow a torn line
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(op) + "\n" for _, op in ops)
+        os.replace(tmp, path)
+        draft._log_path = path
+        return draft
+
+    def _log_op(self, **op):
+        if self._log_path is None: return
+        if self._log is None:
+            self._log = open(self._log_path, "a", encoding="utf-8")
+        self._log.write(json.dumps(op) + "\n")
+        self._log.flush()
 
     def next_pick_index(self):
         return len(self.picks)
 
+    def team_for_pick(self, idx):
+        """Team slot making the (0-indexed) pick idx in snake order, or None past the last round."""
+        if idx >= self.teams * self.rounds: return None
+        rnd, pos_in_round = divmod(idx, self.teams)
+        return pos_in_round + 1 if rnd % 2 == 0 else self.teams - pos_in_round
+
     def on_clock_team(self):
-        idx = self.next_pick_index()
-        if idx >= len(self.order): return None
-        _, _, _, slot = self.order[idx]
-        return slot
+        return self.team_for_pick(self.next_pick_index())
 
     def round_and_pick(self):
         idx = self.next_pick_index()
-        if idx >= len(self.order): return (None, None, None)
-        rnd, pwr, gp, slot = self.order[idx]
-        return rnd, pwr, gp
+        if idx >= self.teams * self.rounds: return (None, None, None)
+        rnd, pos_in_round = divmod(idx, self.teams)
+        return rnd + 1, pos_in_round + 1, idx + 1
 
     def available_players(self):
-        return [p for p in self.players if not p.get("taken_by")]
+        return list(self._available.values())
 
     def find_player(self, name):
         name_norm = name.strip().lower()
+        p = self._name_index.get(name_norm)
+        if p is not None:
+            return p
+        # try loose match
         for p in self.players:
-            if p["Player"].strip().lower() == name_norm:
+            if name_norm in p._name_key:
                 return p
-        # try loose match
-        cands = [p for p in self.players if name_norm in p["Player"].strip().lower()]
-        return cands[0] if cands else None
+        return None
 
     def add_player_if_missing(self, name, pos="WR", team="", work_rank=9999.0, risktag="volatile"):
         if self.find_player(name):
             return
-        row = {
-            "ConsensusRank": str(int(work_rank)) if work_rank < 9999 else "",
-            "Player": name,
-            "Team": team,
-            "Pos": pos,
-            "Bye": "",
-            "FP_ECR_Rank": "",
-            "ESPN_Clay_Rank": "",
-            "DS_Rank": "",
-            "RiskTag": risktag,
-            "Tier": "",
-            "Notes": "added-live",
-            "work_rank": float(work_rank),
-            "taken_by": None
-        }
-        self.players.append(row)
+        p = Player(name, Team=team, Pos=pos, RiskTag=risktag, Notes="added-live",
+                   ConsensusRank=str(int(work_rank)) if work_rank < 9999 else "",
+                   work_rank=float(work_rank))
+        self.players.append(p)
+        self._name_index.setdefault(p._name_key, p)
+        self._available[id(p)] = p
+        self._log_op(op="add", player=name, pos=pos, team=team, rank=work_rank, risktag=risktag)
 
     def record_pick(self, team_slot, player_name):
         p = self.find_player(player_name)
@@ -273,38 +382,62 @@ class Draft:
             # Auto-add unknown player with low priority
             self.add_player_if_missing(player_name, pos="WR", team="", work_rank=1500, risktag="volatile")
             p = self.find_player(player_name)
-        if p.get("taken_by"):
-            return f"{p['Player']} is already taken by Team {p['taken_by']}."
-        p["taken_by"] = team_slot
-        self.picks.append({"global_pick": len(self.picks)+1, "team_slot": team_slot, "player": p["Player"]})
+        if p.taken_by:
+            return f"{p.Player} is already taken by Team {p.taken_by}."
+        p.taken_by = team_slot
+        del self._available[id(p)]
+        self.picks.append({"global_pick": len(self.picks)+1, "team_slot": team_slot, "player": p.Player, "_ref": p})
         self.team_rosters[team_slot].append(p)
-        return f"Recorded pick #{len(self.picks)}: Team {team_slot} -> {p['Player']} ({p['Pos']})"
+        self._log_op(op="pick", team=team_slot, player=p.Player)
+        return f"Recorded pick #{len(self.picks)}: Team {team_slot} -> {p.Player} ({p.Pos})"
 
     def undo(self):
         if not self.picks: return "No picks to undo."
         last = self.picks.pop()
         # clear player
-        for p in self.players:
-            if p["Player"] == last["player"] and p.get("taken_by") == last["team_slot"]:
-                p["taken_by"] = None
-                break
-        # remove from roster
-        r = self.team_rosters[last["team_slot"]]
-        for i in range(len(r)-1, -1, -1):
-            if r[i]["Player"] == last["player"]:
-                r.pop(i); break
+        p = last["_ref"]
+        p.taken_by = None
+        # undo is rare; rebuild so the player returns to their ranking position
+        self._available = {id(q): q for q in self.players if not q.taken_by}
+        # picks are undone newest-first, so this pick is the last on its roster
+        self.team_rosters[last["team_slot"]].pop()
+        self._log_op(op="undo")
         return f"Undid pick #{last['global_pick']} ({last['player']})"
 
+    def set_rank(self, p, src, rk):
+        """Apply a live `setrank` edit: src is espn, fp, ds or consensus."""
+        if src == "consensus":
+            # consensus overrides work_rank until the next espn/fp/ds edit
+            p.ConsensusRank = str(rk)
+            p.work_rank = float(rk)
+        else:
+            col = SETRANK_COLUMNS[src]
+            w = dict(RANK_WEIGHTS)[col]
+            old = to_float(getattr(p, col))
+            setattr(p, col, str(rk))
+            # update the weighted average in place rather than re-parsing every column
+            if old is None:
+                p._rank_num += rk*w
+                p._weight_den += w
+            else:
+                p._rank_num += (rk - old)*w
+            p.work_rank = p._rank_num / p._weight_den
+        self._log_op(op="setrank", player=p.Player, src=src, rank=rk)
+
+    def set_tags(self, p, tags):
+        set_risk_tag(p, tags)
+        self._log_op(op="tag", player=p.Player, tags=tags)
+
     # ---------- New: Roster needs strings ----------
     def my_needs_str(self):
         my_roster = list(self.team_rosters[self.my_slot])
-        need = needs_for_roster(my_roster, self.roster_slots)
+        need = fast_needs(my_roster, self.roster_slots)
         return needs_str(need)
 
     def all_needs_report(self):
         lines = ["=== Roster Needs (starters remaining) ==="]
         for t in range(1, self.teams+1):
-            need = needs_for_roster(self.team_rosters[t], self.roster_slots)
+            need = fast_needs(self.team_rosters[t], self.roster_slots)
             lines.append(f"Team {t}: {needs_str(need)}")
         return "\n".join(lines)
 
@@ -315,36 +448,24 @@ class Draft:
         on_clock = self.on_clock_team()
         my_turn = (on_clock == self.my_slot)
 
-        # Build my roster view with inferred starter slots
+        # Positional need multipliers for my roster, shared by every candidate
         my_roster = list(self.team_rosters[self.my_slot])
-        # Label starters & flex
-        my_roster_with_slots = assign_starters(my_roster, self.roster_slots)
+        need_table = build_need_table(my_roster, self.roster_slots, rnd)
 
-        avail = self.available_players()
         # Score candidates
-        scored = []
-        for p in avail:
-            vs = value_score(p, self.roster_slots, my_roster_with_slots, rnd)
-            rs = risk_score(p)
-            scored.append((vs, rs, p))
-        # Sort by value desc
-        scored.sort(key=lambda x: (-x[0], x[1]))
-
-        # SAFE pick: prefer lower risk_score
-        safe = None
-        for vs, rs, p in scored:
-            if rs <= 0 or "rookie" not in (p.get("RiskTag","")):
-                safe = p; break
-        if not safe and scored:
-            safe = scored[0][2]
-        # RISKY pick: prefer higher risk_score + value
-        risky = None
-        risky_sorted = sorted(scored, key=lambda x: (-x[0] + 0.5*x[1]))
-        if risky_sorted:
-            risky = risky_sorted[0][2]
-
-        # Build top board
-        top_board = [p for _,__,p in scored[:25]]
+        scored = score_candidates(self.available_players(), need_table)
+        rank_key = lambda x: (-x[0], x[1])
+        # Top board by value desc; partial selection instead of a full sort
+        top_board = [p for _,__,p in heapq.nsmallest(25, scored, key=rank_key)]
+
+        # SAFE pick: prefer lower risk
+        safe = min((x for x in scored if x[1] <= 0 or "rookie" not in x[2].RiskTag),
+                   key=rank_key, default=None)
+        safe = safe[2] if safe else (top_board[0] if top_board else None)
+        # RISKY pick: prefer higher risk + value (ties keep board order)
+        risky = min(scored, key=lambda x: (-x[0] + 0.5*x[1], -x[0], x[1]), default=None)
+        risky = risky[2] if risky else None
+
         lines = []
         lines.append(f"On clock: Team {on_clock}  (Round {rnd}, Overall #{gp})")
         if my_turn:
@@ -362,11 +483,10 @@ class Draft:
     def show_board(self, n=25):
         rnd, _, _ = self.round_and_pick()
         my_roster = list(self.team_rosters[self.my_slot])
-        avail = self.available_players()
-        scored = [(value_score(p, self.roster_slots, assign_starters(my_roster, self.roster_slots), rnd), p) for p in avail]
-        scored.sort(key=lambda x: -x[0])
+        need_table = build_need_table(my_roster, self.roster_slots, rnd)
+        scored = score_candidates(self.available_players(), need_table)
         out = []
-        for i, (_, p) in enumerate(scored[:n], start=1):
+        for i, (_, _, p) in enumerate(heapq.nsmallest(n, scored, key=lambda x: -x[0]), start=1):
             out.append(f"{i:>2}. {printable_player(p)}")
         return "\n".join(out)
 
@@ -378,8 +498,7 @@ class Draft:
             if not roster:
                 out.append("  (empty)")
                 continue
-            for pl in roster:
-                out.append(f"  - {printable_player(pl)}")
+            out.extend(f"  - {printable_player(pl)}" for pl in roster)
         return "\n".join(out)
 
     def board_full(self):
@@ -390,8 +509,7 @@ class Draft:
             if not roster:
                 out.append("  (empty)")
                 continue
-            for pl in roster:
-                out.append(f"  - {pl['Player']} {pl['Team']} {pl['Pos']}")
+            out.extend(pl._short_line for pl in roster)
         return "\n".join(out)
 
     def save(self, path="draft_state.json"):
@@ -399,14 +517,18 @@ class Draft:
             "teams": self.teams,
             "my_slot": self.my_slot,
             "rounds": self.rounds,
-            "picks": self.picks,
+            "picks": [{k: v for k,v in pk.items() if not k.startswith("_")} for pk in self.picks],
             "team_rosters": {
-                str(k): [{"Player": p["Player"], "Team": p["Team"], "Pos": p["Pos"]} for p in v]
+                str(k): [{"Player": p.Player, "Team": p.Team, "Pos": p.Pos} for p in v]
                 for k,v in self.team_rosters.items()
             },
         }
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         return f"Saved -> {path}"
 
 def repl(draft: "Draft"):
@@ -428,6 +550,80 @@ def repl(draft: "Draft"):
       help                         Show commands
       quit                         Exit
     """)
+
+    def cmd_find(line):
+        q = line[5:].strip().strip('"').lower()
+        hits = [p for p in draft.available_players() if q in p._name_key]
+        if not hits: return "No matches."
+        return "\n".join(f"{i:>2}. {printable_player(p)}" for i,p in enumerate(hits[:50], start=1))
+
+    def cmd_me(line):
+        name = line[3:].strip().strip('"')
+        return draft.record_pick(draft.my_slot, name)
+
+    def cmd_other(line):
+        name = line[6:].strip().strip('"')
+        team = draft.on_clock_team()
+        if team == draft.my_slot:
+            # a snake slot picks at most twice in a row, so look two picks ahead
+            idx = draft.next_pick_index()
+            for j in (idx+1, idx+2):
+                slot = draft.team_for_pick(j)
+                if slot is not None and slot != draft.my_slot:
+                    team = slot; break
+        return draft.record_pick(team, name)
+
+    def cmd_add(line):
+        m = _ADD_RE.match(line)
+        if not m:
+            return 'Usage: add "Name" POS TEAM [rank]'
+        nm, pos, tm, rk = m.group(1), m.group(2), m.group(3), m.group(4)
+        rank = float(rk) if rk else 1500.0
+        draft.add_player_if_missing(nm, pos=pos, team=tm, work_rank=rank, risktag="volatile")
+        return f'Added {nm} ({pos}, {tm}) with rank {rank}.'
+
+    def cmd_setrank(line):
+        m = _SETRANK_RE.match(line.lower())
+        if not m:
+            return 'Usage: setrank [espn|fp|ds|consensus] "Name" N'
+        src, nm, rk = m.group(1), m.group(2), int(m.group(3))
+        p = draft.find_player(nm)
+        if not p:
+            return "Player not found."
+        draft.set_rank(p, src, rk)
+        return f"Set {src} rank for {p.Player} to {rk}."
+
+    def cmd_tag(line):
+        m = _TAG_RE.match(line)
+        if not m:
+            return 'Usage: tag "Name" tag1,tag2'
+        nm, tags = m.group(1), m.group(2)
+        p = draft.find_player(nm)
+        if not p:
+            return "Player not found."
+        draft.set_tags(p, tags)
+        return f"Updated RiskTag for {p.Player} -> {tags}"
+
+    # Whole-line commands, and commands keyed by their first word
+    commands = {
+        "help": lambda: HELP,
+        "suggest": draft.suggest,
+        "board": draft.show_board,
+        "board_full": draft.board_full,
+        "needs": draft.all_needs_report,
+        "teams": draft.show_teams,
+        "undo": draft.undo,
+        "save": draft.save,
+    }
+    prefixed = {
+        "find": cmd_find,
+        "me": cmd_me,
+        "other": cmd_other,
+        "add": cmd_add,
+        "setrank": cmd_setrank,
+        "tag": cmd_tag,
+    }
+
     print("Type 'help' for commands.")
     while True:
         try:
@@ -441,79 +637,13 @@ def repl(draft: "Draft"):
         if low in {"quit","exit"}:
             print("Bye")
             return
-        if low == "help":
-            print(HELP); continue
-        if low == "suggest":
-            print(draft.suggest()); continue
-        if low == "board":
-            print(draft.show_board()); continue
-        if low == "board_full":
-            print(draft.board_full()); continue
-        if low == "needs":
-            print(draft.all_needs_report()); continue
-        if low == "teams":
-            print(draft.show_teams()); continue
-        if low.startswith("find "):
-            q = line[5:].strip().strip('"').lower()
-            hits = [p for p in draft.available_players() if q in p["Player"].lower()]
-            if not hits: print("No matches."); continue
-            for i,p in enumerate(hits[:50], start=1):
-                print(f"{i:>2}. {printable_player(p)}")
-            continue
-        if low.startswith("me "):
-            name = line[3:].strip().strip('"')
-            print(draft.record_pick(draft.my_slot, name)); continue
-        if low.startswith("other "):
-            name = line[6:].strip().strip('"')
-            team = draft.on_clock_team()
-            if team == draft.my_slot:
-                idx = draft.next_pick_index()
-                for j in range(idx, len(draft.order)):
-                    _,_,_, slot = draft.order[j]
-                    if slot != draft.my_slot:
-                        team = slot; break
-            print(draft.record_pick(team, name)); continue
-        if low.startswith("add "):
-            m = re.match(r'add\s+"([^"]+)"\s+([A-Z]+)\s+([A-Z]{2,3})\s*(\d+)?', line)
-            if not m:
-                print('Usage: add "Name" POS TEAM [rank]'); continue
-            nm, pos, tm, rk = m.group(1), m.group(2), m.group(3), m.group(4)
-            rank = float(rk) if rk else 1500.0
-            draft.add_player_if_missing(nm, pos=pos, team=tm, work_rank=rank, risktag="volatile")
-            print(f'Added {nm} ({pos}, {tm}) with rank {rank}.'); continue
-        if low.startswith("setrank "):
-            m = re.match(r'setrank\s+(espn|fp|ds|consensus)\s+"([^"]+)"\s+(\d+)', low)
-            if not m:
-                print('Usage: setrank [espn|fp|ds|consensus] "Name" N'); continue
-            src, nm, rk = m.group(1), m.group(2), int(m.group(3))
-            p = draft.find_player(nm)
-            if not p:
-                print("Player not found."); continue
-            if src == "espn":
-                p["ESPN_Clay_Rank"] = str(rk)
-            elif src == "fp":
-                p["FP_ECR_Rank"] = str(rk)
-            elif src == "ds":
-                p["DS_Rank"] = str(rk)
-            else:
-                p["ConsensusRank"] = str(rk)
-            p["work_rank"] = float(rk) if src=="consensus" else composite_rank(p)
-            print(f"Set {src} rank for {p['Player']} to {rk}."); continue
-            # no recompute for all; lazy recompute occurs on next suggest/board
-        if low.startswith("tag "):
-            m = re.match(r'tag\s+"([^"]+)"\s+(.+)$', line, flags=re.IGNORECASE)
-            if not m:
-                print('Usage: tag "Name" tag1,tag2'); continue
-            nm, tags = m.group(1), m.group(2)
-            p = draft.find_player(nm)
-            if not p:
-                print("Player not found."); continue
-            p["RiskTag"] = tags
-            print(f"Updated RiskTag for {p['Player']} -> {tags}"); continue
-        if low == "undo":
-            print(draft.undo()); continue
-        if low == "save":
-            print(draft.save()); continue
+        handler = commands.get(low)
+        if handler:
+            print(handler()); continue
+        head, sep, _ = low.partition(" ")
+        handler = prefixed.get(head) if sep else None
+        if handler:
+            print(handler(line)); continue
 
         print("Unknown command. Type 'help' for commands.")
 
@@ -524,7 +654,31 @@ def main():
     if not players:
         print("No players loaded from CSV. Please check --csv path.")
         return
-    draft = Draft(args.teams, args.pick, args.rounds, players, roster_slots)
+    if args.resume:
+        try:
+            draft = Draft.replay(args.log, args.teams, args.pick, args.rounds, players, roster_slots)
+        except FileNotFoundError:
+            print(f"No picks log at {args.log}; nothing to resume.")
+            return
+        except ValueError as e:
+            print(e)
+            return
+        for warning in draft.replay_warnings:
+            print(warning)
+        print(f"Resumed {len(draft.picks)} picks from {args.log}.")
+    else:
+        # Never silently overwrite an unfinished draft; the log is the crash autosave
+        if not args.new and os.path.exists(args.log):
+            try:
+                in_progress = draft_in_progress(read_log(args.log)[0])
+            except ValueError:
+                in_progress = True
+            if in_progress:
+                print(f"{args.log} already holds a draft in progress. "
+                      "Rerun with --resume to continue it, or --new to discard it and start over.")
+                return
+        # Fresh draft: Draft starts a new picks log
+        draft = Draft(args.teams, args.pick, args.rounds, players, roster_slots, log_path=args.log)
     print(f"Loaded {len(players)} players from {args.csv}.")
     print(f"Teams: {args.teams}, Your slot: {args.pick}, Rounds: {args.rounds}, Scoring: {args.format.upper()}")
     print("Roster:", ", ".join(f"{k}:{v}" for k,v in roster_slots.items()))